@@ -0,0 +1,12 @@
+"""
+Process-wide locks shared by every Streamlit session.
+
+src/ui.py is re-executed on every rerun and st.cache_resource entries are
+dropped by "Clear cache", so locks that must outlive both live here, in a
+module that is imported once per process.
+"""
+
+import threading
+
+# Serializes chat file writes together with the matching chat index update
+CHAT_INDEX_LOCK = threading.RLock()
@@ -1,6 +1,9 @@
 import asyncio
 import typer
-import toml
+try:
+    import tomllib
+except ModuleNotFoundError:
+    import tomli as tomllib
 from dataclasses import dataclass, field
 from typing import Dict, List
 from agents import Agent, ModelSettings, Runner, WebSearchTool, FileSearchTool
@@ -22,7 +25,8 @@ class ConversationContext:
     preferences: Dict = field(default_factory=dict)
 
 # === Initialize All Agents ===
-cocktail_spec_finder_agent_config = toml.load("etc/cocktail_spec_finder.toml")
+with open("etc/cocktail_spec_finder.toml", "rb") as f:
+    cocktail_spec_finder_agent_config = tomllib.load(f)
 cocktail_spec_finder = Agent(
     name="Cocktail Spec Finder",
     instructions=cocktail_spec_finder_agent_config["cocktail_spec_finder"]["instructions"],
@@ -32,7 +36,8 @@ cocktail_spec_finder = Agent(
     model_settings=ModelSettings(temperature=cocktail_spec_finder_agent_config["cocktail_spec_finder"]["temperature"])
 )
 
-flavor_affinity_config = toml.load("etc/flavor_affinity_agent.toml")
+with open("etc/flavor_affinity_agent.toml", "rb") as f:
+    flavor_affinity_config = tomllib.load(f)
 flavor_affinity_agent = Agent(
     name="Flavor Affinity Agent",
     instructions=flavor_affinity_config["flavor_affinity_agent"]["instructions"],
@@ -42,7 +47,8 @@ flavor_affinity_agent = Agent(
     model_settings=ModelSettings(temperature=flavor_affinity_config["flavor_affinity_agent"]["temperature"])
 )
 
-cocktail_spec_analyzer_agent_config = toml.load("etc/cocktail_spec_analyzer.toml")
+with open("etc/cocktail_spec_analyzer.toml", "rb") as f:
+    cocktail_spec_analyzer_agent_config = tomllib.load(f)
 cocktail_spec_analyzer = Agent(
     name="Cocktail Spec Analyzer",
     instructions=cocktail_spec_analyzer_agent_config["cocktail_spec_analyzer"]["instructions"],
@@ -52,7 +58,8 @@ cocktail_spec_analyzer = Agent(
     model_settings=ModelSettings(temperature=cocktail_spec_analyzer_agent_config["cocktail_spec_analyzer"]["temperature"])
 )
 
-cocktail_naming_agent_config = toml.load("etc/cocktail_naming_agent.toml")
+with open("etc/cocktail_naming_agent.toml", "rb") as f:
+    cocktail_naming_agent_config = tomllib.load(f)
 cocktail_naming_agent = Agent(
     name="Cocktail Naming Agent",
     instructions=cocktail_naming_agent_config["cocktail_naming_agent"]["instructions"],
@@ -62,7 +69,8 @@ cocktail_naming_agent = Agent(
     model_settings=ModelSettings(temperature=cocktail_naming_agent_config["cocktail_naming_agent"]["temperature"])
 )
 
-bottle_inventory_agent_config = toml.load("etc/bottle_inventory_agent.toml")
+with open("etc/bottle_inventory_agent.toml", "rb") as f:
+    bottle_inventory_agent_config = tomllib.load(f)
 bottle_inventory_agent = Agent(
     name="Bottle Inventory Agent",
     instructions=bottle_inventory_agent_config["bottle_inventory_agent"]["instructions"],
@@ -75,7 +83,8 @@ bottle_inventory_agent = Agent(
     model_settings=ModelSettings(temperature=bottle_inventory_agent_config["bottle_inventory_agent"]["temperature"])
 )
 
-wine_agent = toml.load("etc/wine_agent.toml")
+with open("etc/wine_agent.toml", "rb") as f:
+    wine_agent = tomllib.load(f)
 wine_agent = Agent(
     name="Wine Agent",
     instructions=wine_agent["wine_agent"]["instructions"],
@@ -85,7 +94,8 @@ wine_agent = Agent(
     model_settings=ModelSettings(temperature=wine_agent["wine_agent"]["temperature"])
 )
 
-insta_post_agent_config = toml.load("etc/instagram_post_agent.toml")
+with open("etc/instagram_post_agent.toml", "rb") as f:
+    insta_post_agent_config = tomllib.load(f)
 insta_vector_id = INSTA_POST_OPENAI_DB
 instagram_post_agent = Agent(
     name="Instagram Post Agent",
@@ -101,7 +111,8 @@ instagram_post_agent = Agent(
     model_settings=ModelSettings(temperature=insta_post_agent_config["instagram_post_agent"]["temperature"])
 )
 
-instructions_config = toml.load("etc/main_agent_instructions.toml")
+with open("etc/main_agent_instructions.toml", "rb") as f:
+    instructions_config = tomllib.load(f)
 main_agent = Agent(
     name="Cocktail Development Orchestrator",
     instructions=instructions_config["main_agent"]["instructions"],
@@ -134,7 +145,8 @@ main_agent = Agent(
     model=instructions_config["main_agent"]["model"],
 )
 
-bottle_researcher_agent_config = toml.load("etc/bottle_researcher_agent.toml")
+with open("etc/bottle_researcher_agent.toml", "rb") as f:
+    bottle_researcher_agent_config = tomllib.load(f)
 bottle_researcher_agent = Agent(
     name="Bottle Researcher",
     instructions=bottle_researcher_agent_config["bottle_researcher_agent"]["instructions"],
@@ -8,7 +8,10 @@ including retrieving all available type tags and filtering bottles by type, name
 
 import sys
 from pathlib import Path
-import toml
+try:
+    import tomllib
+except ModuleNotFoundError:
+    import tomli as tomllib
 from notion_client import Client
 from src.settings import (
     NOTION_API_KEY,
@@ -20,7 +23,8 @@ from src.settings import (
 def load_config(config_path):
     """Load configuration from TOML file."""
     try:
-        return toml.load(config_path)
+        with open(config_path, "rb") as f:
+            return tomllib.load(f)
     except Exception as e:
         print(f"Error loading config file: {e}")
         sys.exit(1)
@@ -32,19 +36,19 @@ def create_notion_client(api_key):
 
 def format_bottles(bottles):
     """Format a list bottle objects."""
-    bottle_str = ""
+    parts = []
     for bottle in bottles:
-        bottle_str += f"  - {bottle['name']} ({', '.join(bottle['type'])})"
+        parts.append(f"  - {bottle['name']} ({', '.join(bottle['type'])})")
         if bottle['almost_gone']:
-            bottle_str += " (almost gone)"
+            parts.append(" (almost gone)")
         if bottle['not_for_mixing']:
-            bottle_str += " (not for mixing)"
+            parts.append(" (not for mixing)")
         if bottle['notes']:
-            bottle_str += f"\n    Notes: {bottle['notes']}"
+            parts.append(f"\n    Notes: {bottle['notes']}")
         if bottle['technical_notes']:
-            bottle_str += f"\n    Technical Notes: {bottle['technical_notes']}"
-        bottle_str += "\n"
-    return bottle_str
+            parts.append(f"\n    Technical Notes: {bottle['technical_notes']}")
+        parts.append("\n")
+    return "".join(parts)
 
 
 def format_ingredients(ingredients):
@@ -59,17 +63,17 @@ def format_wines(wines):
     if not wines:
         return "No wines found"
 
-    wine_str = f"{len(wines)} wines found:\n"
+    parts = [f"{len(wines)} wines found:\n"]
     for wine in wines:
-        wine_str += f"  - {wine['name']}"
+        parts.append(f"  - {wine['name']}")
         if wine['vintage_year']:
-            wine_str += f" ({wine['vintage_year']})"
+            parts.append(f" ({wine['vintage_year']})")
         if wine['notes']:
-            wine_str += f"\n    Notes: {wine['notes']}"
+            parts.append(f"\n    Notes: {wine['notes']}")
         if wine['technical_notes']:
-            wine_str += f"\n    Technical Notes: {wine['technical_notes']}"
-        wine_str += "\n"
-    return wine_str
+            parts.append(f"\n    Technical Notes: {wine['technical_notes']}")
+        parts.append("\n")
+    return "".join(parts)
 
 
 def parse_notion_row_to_bottle(result):
@@ -11,13 +11,17 @@ import os
 import sys
 from pathlib import Path
 import jsonlines
-import toml
+try:
+    import tomllib
+except ModuleNotFoundError:
+    import tomli as tomllib
 from notion_client import Client
 
 def load_config(config_path):
     """Load configuration from TOML file."""
     try:
-        return toml.load(config_path)
+        with open(config_path, "rb") as f:
+            return tomllib.load(f)
     except Exception as e:
         print(f"Error loading config file: {e}")
         sys.exit(1)
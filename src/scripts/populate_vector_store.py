@@ -12,9 +12,14 @@ import sys
 import json
 import argparse
 import logging
+import queue
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-import toml
+try:
+    import tomllib
+except ModuleNotFoundError:
+    import tomli as tomllib
 import openai
 
 # Set up logging
@@ -31,6 +36,10 @@ logger = logging.getLogger(__name__)
 # Disable httpx INFO logging
 logging.getLogger("httpx").setLevel(logging.WARNING)
 
+# Number of concurrent uploads and how far serialization may run ahead of them
+UPLOAD_WORKERS = 8
+SERIALIZE_QUEUE_SIZE = 32
+
 
 def parse_arguments():
     """Parse command-line arguments."""
@@ -116,6 +125,95 @@ def check_vector_store_status(client, vector_store_id):
         return []
 
 
+def write_record_files(records, output_dir, file_queue):
+    """
+    Write each record to its own temporary JSON file and queue the path for upload.
+    
+    Args:
+        records: The parsed JSONL records
+        output_dir: The directory to write the temporary files to
+        file_queue: The queue the upload workers read file paths from
+        
+    Returns:
+        The number of records that could not be written
+    """
+    failed_writes = 0
+    try:
+        for i, record in enumerate(records):
+            try:
+                # Create a meaningful filename
+                title = record.get("title", "untitled").replace(" ", "_")
+                filename = f"cocktail_{i}_{title}.json"
+                temp_file_path = os.path.join(output_dir, filename)
+                
+                # Write each record as a separate file
+                with open(temp_file_path, "w", encoding="utf-8") as temp_file:
+                    json.dump(record, temp_file, ensure_ascii=False, indent=2)
+                
+                file_queue.put(temp_file_path)
+            except Exception as e:
+                logger.error(f"Error writing record {i}: {e}")
+                failed_writes += 1
+    finally:
+        # One sentinel per worker so every upload worker exits
+        for _ in range(UPLOAD_WORKERS):
+            file_queue.put(None)
+    return failed_writes
+
+
+def upload_file(client, vector_store_id, temp_file_path):
+    """
+    Upload a single file to OpenAI, add it to the vector store and remove it locally.
+    
+    Returns:
+        True if the upload succeeded, False otherwise
+    """
+    try:
+        # Upload the file to OpenAI
+        with open(temp_file_path, "rb") as file_content:
+            file_response = client.files.create(
+                file=file_content,
+                purpose="user_data"
+            )
+        
+        # Add the file to the vector store
+        client.vector_stores.files.create(
+            vector_store_id=vector_store_id,
+            file_id=file_response.id
+        )
+        
+        logger.info(f"Successfully uploaded {os.path.basename(temp_file_path)} to vector store")
+        return True
+        
+    except Exception as e:
+        logger.error(f"Error uploading {os.path.basename(temp_file_path)}: {str(e)}")
+        return False
+    
+    finally:
+        # Clean up the temporary file
+        try:
+            os.remove(temp_file_path)
+        except:
+            pass
+
+
+def upload_worker(client, vector_store_id, file_queue):
+    """
+    Upload queued files until the producer's sentinel is reached.
+    
+    Returns:
+        A (successful_uploads, failed_uploads) tuple
+    """
+    successful_uploads = 0
+    failed_uploads = 0
+    while (temp_file_path := file_queue.get()) is not None:
+        if upload_file(client, vector_store_id, temp_file_path):
+            successful_uploads += 1
+        else:
+            failed_uploads += 1
+    return successful_uploads, failed_uploads
+
+
 def populate_vector_store(client, vector_store_id, data_path, force_update=True):
     """
     Populate the vector store with data from the JSONL file.
@@ -148,53 +246,22 @@ def populate_vector_store(client, vector_store_id, data_path, force_update=True)
         
         logger.info(f"Found {len(records)} records in JSONL file")
         
-        # Create temporary files for each record
-        temp_files = []
-        for i, record in enumerate(records):
-            # Create a meaningful filename
-            title = record.get("title", "untitled").replace(" ", "_")
-            filename = f"cocktail_{i}_{title}.json"
-            temp_file_path = os.path.join(os.path.dirname(data_path), filename)
-            
-            # Write each record as a separate file
-            with open(temp_file_path, "w", encoding="utf-8") as temp_file:
-                json.dump(record, temp_file, ensure_ascii=False, indent=2)
-            
-            temp_files.append(temp_file_path)
-        
-        logger.info(f"Created {len(temp_files)} temporary files")
-        
-        # Upload each file to OpenAI and add to the vector store
-        successful_uploads = 0
-        failed_uploads = 0
+        # Serialize records on a producer thread while the upload workers drain the queue
+        file_queue = queue.Queue(maxsize=SERIALIZE_QUEUE_SIZE)
+        with ThreadPoolExecutor(max_workers=UPLOAD_WORKERS + 1) as executor:
+            producer = executor.submit(
+                write_record_files, records, os.path.dirname(data_path), file_queue
+            )
+            workers = [
+                executor.submit(upload_worker, client, vector_store_id, file_queue)
+                for _ in range(UPLOAD_WORKERS)
+            ]
+            counts = [worker.result() for worker in workers]
+            # Records that failed to serialize never reach a worker but still count as failures
+            failed_writes = producer.result()
         
-        for temp_file_path in temp_files:
-            try:
-                # Upload the file to OpenAI
-                with open(temp_file_path, "rb") as file_content:
-                    file_response = client.files.create(
-                        file=file_content,
-                        purpose="user_data"
-                    )
-                
-                # Add the file to the vector store
-                client.vector_stores.files.create(
-                    vector_store_id=vector_store_id,
-                    file_id=file_response.id
-                )
-                
-                logger.info(f"Successfully uploaded {os.path.basename(temp_file_path)} to vector store")
-                successful_uploads += 1
-                
-            except Exception as e:
-                logger.error(f"Error uploading {os.path.basename(temp_file_path)}: {str(e)}")
-                failed_uploads += 1
-            
-            # Clean up the temporary file
-            try:
-                os.remove(temp_file_path)
-            except:
-                pass
+        successful_uploads = sum(success for success, _ in counts)
+        failed_uploads = sum(failed for _, failed in counts) + failed_writes
         
         logger.info(f"Upload complete: {successful_uploads} successful, {failed_uploads} failed")
         return successful_uploads > 0
@@ -217,7 +284,8 @@ def main():
         config_path, data_path = get_paths(args.config)
         
         # Load configuration
-        config = toml.load(config_path)
+        with open(config_path, "rb") as f:
+            config = tomllib.load(f)
         
         # Check if we have a vector store ID in the config
         if "openai" not in config or "insta_post_vector_db" not in config["openai"]:
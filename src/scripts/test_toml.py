@@ -1,4 +1,7 @@
-import toml
+try:
+    import tomllib
+except ModuleNotFoundError:
+    import tomli as tomllib
 import json
 
 
@@ -8,7 +11,7 @@ def load_and_print_toml(file_path):
         with open(file_path, "r", encoding="utf-8") as f:
             content = f.read()
         
-        parsed_toml = toml.loads(content)
+        parsed_toml = tomllib.loads(content)
         print("\nParsed TOML:")
         for key, value in parsed_toml.items():
             print(f"{key}: {json.dumps(value, indent=2)}")
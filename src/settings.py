@@ -1,9 +1,14 @@
-import toml
-
+from pathlib import Path
 try:
-    secrets_config = toml.load("etc/local_config.toml")
-except:
-    secrets_config = toml.load("etc/config.toml")
+    import tomllib
+except ModuleNotFoundError:
+    import tomli as tomllib
+
+LOCAL_CONFIG_PATH = Path("etc/local_config.toml")
+CONFIG_PATH = Path("etc/config.toml")
+
+with open(LOCAL_CONFIG_PATH if LOCAL_CONFIG_PATH.exists() else CONFIG_PATH, "rb") as f:
+    secrets_config = tomllib.load(f)
 
 OPENAI_API_KEY = secrets_config["api_keys"]["openai"]
 NOTION_API_KEY = secrets_config["api_keys"]["notion"]
@@ -1,37 +1,120 @@
 import streamlit as st
 import asyncio
-import json
+import heapq
+import mmap
+import orjson
 import os
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from itertools import groupby
+from operator import itemgetter
 from typing import Dict, List, Optional
 from pathlib import Path
 
+import httpx
 from src.cocktail_dev_agent import AGENTS
-from agents import Runner
+from src.chat_locks import CHAT_INDEX_LOCK
+from src.settings import OPENAI_API_KEY
+from agents import Runner, set_default_openai_client
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+from openai.types.responses import ResponseTextDeltaEvent
 
 # Create chat history directory
 CHAT_HISTORY_DIR = Path("chat_history")
 CHAT_HISTORY_DIR.mkdir(exist_ok=True)
+# Listing metadata for every chat, so the sidebar never parses transcripts
+CHAT_INDEX_FILE = CHAT_HISTORY_DIR / "_index.json"
+# Messages spilled out of session state by chats that are still in progress
+SPILL_DIR = CHAT_HISTORY_DIR / "spill"
+SPILL_DIR.mkdir(exist_ok=True)
+# Spill files untouched for this long belong to sessions that are gone
+SPILL_FILE_MAX_AGE_SECONDS = 7 * 24 * 60 * 60
+# Concurrent chat file reads when the index has to be rebuilt
+INDEX_REBUILD_WORKERS = 8
+# Conversation window sent to the agent each turn
+PROMPT_WINDOW_MESSAGES = 6
+MAX_PROMPT_CHARS = 24000
+# Messages kept in session state; older ones are spilled to disk
+MAX_SESSION_MESSAGES = 500
+# Pooled keep-alive connections shared by every chat in this process
+OPENAI_KEEPALIVE_CONNECTIONS = 20
+# Trailing messages rendered in the chat view on every rerun
+RENDER_WINDOW_MESSAGES = 20
+# Divider between consecutive same-role messages rendered as one block
+MESSAGE_SEPARATOR = "\n\n---\n\n"
+# Chat files larger than this are parsed from a read-only memory map
+MMAP_READ_THRESHOLD = 64 * 1024
+# Chat index fields shown in the chat management table; id stays hidden
+CHAT_TABLE_COLUMNS = ("id", "name", "rating", "notes", "created", "agent", "message_count")
+
+# Agent descriptions
+AGENT_DESCRIPTIONS = {
+    "main": "🎯 Main orchestrator for cocktail development conversations",
+    "wine": "🍷 Specialized agent for wine selection and pairing",
+    "cocktail_spec_finder": "🔍 Finds cocktail specifications from the web",
+    "flavor_affinity": "🌿 Discovers flavor affinities and combinations",
+    "cocktail_spec_analyzer": "📊 Analyzes cocktail specifications and provides feedback",
+    "cocktail_naming": "✨ Creates creative names for cocktails",
+    "bottle_inventory": "📋 Manages and searches bottle inventory",
+    "instagram_post": "📱 Searches historical Instagram posts",
+    "bottle_researcher": "🔬 Researches and updates bottle information"
+}
+AGENT_ITEMS = tuple(AGENT_DESCRIPTIONS.items())
+AGENT_KEYS = tuple(AGENT_DESCRIPTIONS)
+
+# Immutable session state defaults; chat_history is set up by set_chat_history
+SESSION_DEFAULTS = {
+    "selected_agent": None,
+    "chat_active": False,
+    "current_chat_id": None,
+    "chat_name": ""
+}
+
+def read_json(path: Path):
+    """Parse a JSON file, memory-mapping large files instead of copying them"""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size <= MMAP_READ_THRESHOLD:
+            return orjson.loads(f.read())
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as view:
+                return orjson.loads(view)
+
+def write_json(path: Path, data):
+    """Atomically replace a file with data as compact JSON"""
+    # Readers holding the old file (possibly memory-mapped) keep the old inode;
+    # truncating it in place would fault their mapping. A temp file per writer
+    # means concurrent writers never rename each other's file.
+    with tempfile.NamedTemporaryFile(dir=path.parent, prefix=f"{path.stem}.", suffix=".tmp", delete=False) as tmp_file:
+        try:
+            tmp_file.write(orjson.dumps(data))
+        except BaseException:
+            tmp_file.close()
+            os.unlink(tmp_file.name)
+            raise
+    os.replace(tmp_file.name, path)
 
 def load_chat_data(session_id: str) -> Dict:
     """Load complete chat data including metadata"""
     chat_file = CHAT_HISTORY_DIR / f"{session_id}.json"
     if chat_file.exists():
-        with open(chat_file, 'r') as f:
-            data = json.load(f)
-            # Ensure backward compatibility
-            if isinstance(data, list):
-                return {
-                    "metadata": {
-                        "name": session_id,
-                        "created": session_id,
-                        "agent": "unknown",
-                        "rating": None,
-                        "notes": ""
-                    },
-                    "messages": data
-                }
-            return data
+        data = read_json(chat_file)
+        # Ensure backward compatibility
+        if isinstance(data, list):
+            return {
+                "metadata": {
+                    "name": session_id,
+                    "created": session_id,
+                    "agent": "unknown",
+                    "rating": None,
+                    "notes": ""
+                },
+                "messages": data
+            }
+        return data
     return {"metadata": {}, "messages": []}
 
 def save_chat_data(session_id: str, messages: List[Dict], metadata: Dict):
@@ -41,34 +124,125 @@ def save_chat_data(session_id: str, messages: List[Dict], metadata: Dict):
         "metadata": metadata,
         "messages": messages
     }
-    with open(chat_file, 'w') as f:
-        json.dump(data, f, indent=2)
+    # Hold the index lock across both writes so no reader sees the file without its entry
+    with CHAT_INDEX_LOCK:
+        write_json(chat_file, data)
+        update_chat_index(session_id, metadata, len(messages))
 
 def delete_chat(session_id: str):
     """Delete a chat file"""
     chat_file = CHAT_HISTORY_DIR / f"{session_id}.json"
-    if chat_file.exists():
-        chat_file.unlink()
+    with CHAT_INDEX_LOCK:
+        if chat_file.exists():
+            chat_file.unlink()
+            update_chat_index(session_id, None)
+
+def make_index_entry(session_id: str, metadata: Dict, message_count: int) -> Dict:
+    """Build the listing entry stored in the chat index"""
+    name = metadata.get("name") or session_id
+    rating = metadata.get("rating")
+    rating_display = "⭐" * rating if rating else ""
+    return {
+        "id": session_id,
+        "name": name,
+        "created": metadata.get("created", session_id),
+        "agent": metadata.get("agent", "unknown"),
+        "rating": rating,
+        "notes": metadata.get("notes", ""),
+        "message_count": message_count,
+        # Sidebar button label, precomputed so reruns do no string work
+        "display_label": f"{name[:25]}... {rating_display}"
+    }
+
+def write_chat_index(index: Dict[str, Dict]):
+    """Atomically replace the chat index file"""
+    write_json(CHAT_INDEX_FILE, index)
+    # Stamp the index with the directory's own mtime (same clock), so any later
+    # change to the directory makes the directory newer than the index
+    dir_mtime_ns = CHAT_HISTORY_DIR.stat().st_mtime_ns
+    os.utime(CHAT_INDEX_FILE, ns=(dir_mtime_ns, dir_mtime_ns))
+    _list_chats.clear()
+    _list_recent_chats.clear()
+
+def read_index_entry(chat_file: Path) -> Optional[Dict]:
+    """Parse one chat file into its index entry, or None if it is unreadable"""
+    try:
+        data = load_chat_data(chat_file.stem)
+    except Exception:
+        return None
+    return make_index_entry(chat_file.stem, data.get("metadata", {}), len(data.get("messages", [])))
+
+def rebuild_chat_index() -> Dict[str, Dict]:
+    """Scan every chat file once and write a fresh index"""
+    with CHAT_INDEX_LOCK:
+        chat_files = [chat_file for chat_file in CHAT_HISTORY_DIR.glob("*.json") if chat_file != CHAT_INDEX_FILE]
+        with ThreadPoolExecutor(max_workers=INDEX_REBUILD_WORKERS) as executor:
+            index = {
+                entry["id"]: entry
+                for entry in executor.map(read_index_entry, chat_files)
+                if entry is not None
+            }
+        write_chat_index(index)
+    return index
+
+def load_chat_index() -> Dict[str, Dict]:
+    """Load the chat index, rebuilding it from the chat files if it is missing or outdated"""
+    if CHAT_INDEX_FILE.exists():
+        try:
+            index = read_json(CHAT_INDEX_FILE)
+        except orjson.JSONDecodeError:
+            index = None
+        if index is not None and all("display_label" in entry for entry in index.values()):
+            return index
+    return rebuild_chat_index()
+
+def update_chat_index(session_id: str, metadata: Optional[Dict], message_count: int = 0):
+    """Add, update or (with metadata=None) remove a chat in the index"""
+    with CHAT_INDEX_LOCK:
+        index = load_chat_index()
+        if metadata is None:
+            index.pop(session_id, None)
+        else:
+            index[session_id] = make_index_entry(session_id, metadata, message_count)
+        write_chat_index(index)
+
+@st.cache_data(show_spinner=False)
+def _list_chats(index_mtime_ns: int) -> List[Dict]:
+    """Sorted chat listing, cached per version of the index file"""
+    return sorted(load_chat_index().values(), key=itemgetter("created"), reverse=True)
+
+def stat_index_mtime_ns() -> int:
+    """Modification time of the chat index, or 0 if it is missing"""
+    try:
+        return CHAT_INDEX_FILE.stat().st_mtime_ns
+    except FileNotFoundError:
+        return 0
+
+def get_index_mtime_ns() -> int:
+    """Modification time of the chat index, rebuilding it first if it is older than the chat directory"""
+    index_mtime_ns = stat_index_mtime_ns()
+    # Chat files were added or removed without an index update (e.g. copied in by hand or an interrupted save)
+    if CHAT_HISTORY_DIR.stat().st_mtime_ns > index_mtime_ns:
+        with CHAT_INDEX_LOCK:
+            # Another session may have brought the index up to date while we waited
+            index_mtime_ns = stat_index_mtime_ns()
+            if CHAT_HISTORY_DIR.stat().st_mtime_ns > index_mtime_ns:
+                rebuild_chat_index()
+                index_mtime_ns = stat_index_mtime_ns()
+    return index_mtime_ns
 
 def get_all_chats() -> List[Dict]:
     """Get all chat files with metadata"""
-    chats = []
-    for chat_file in CHAT_HISTORY_DIR.glob("*.json"):
-        try:
-            data = load_chat_data(chat_file.stem)
-            metadata = data.get("metadata", {})
-            chats.append({
-                "id": chat_file.stem,
-                "name": metadata.get("name", chat_file.stem),
-                "created": metadata.get("created", chat_file.stem),
-                "agent": metadata.get("agent", "unknown"),
-                "rating": metadata.get("rating"),
-                "notes": metadata.get("notes", ""),
-                "message_count": len(data.get("messages", []))
-            })
-        except Exception:
-            continue
-    return sorted(chats, key=lambda x: x["created"], reverse=True)
+    return _list_chats(get_index_mtime_ns())
+
+@st.cache_data(show_spinner=False)
+def _list_recent_chats(index_mtime_ns: int, k: int) -> List[Dict]:
+    """The k newest chats, cached per version of the index file"""
+    return heapq.nlargest(k, load_chat_index().values(), key=itemgetter("created"))
+
+def get_recent_chats(k: int = 5) -> List[Dict]:
+    """Get the k most recently created chats, newest first"""
+    return _list_recent_chats(get_index_mtime_ns(), k)
 
 def generate_unique_session_id() -> str:
     """Generate a unique session ID with microsecond precision"""
@@ -88,6 +262,106 @@ def reset_session_id():
     if 'session_id' in st.session_state:
         del st.session_state.session_id
 
+def format_prompt_line(message: Dict) -> str:
+    """Format a chat message the way it appears in the agent prompt"""
+    return f"{message['role']}: {message['content']}"
+
+def get_spill_file() -> Path:
+    """Path of the JSONL file holding messages this browser session spilled out of session state"""
+    # Keyed per browser session rather than per chat, so two sessions that
+    # load the same saved chat never share a spill file
+    if 'spill_id' not in st.session_state:
+        st.session_state.spill_id = generate_unique_session_id()
+    return SPILL_DIR / f"{st.session_state.spill_id}.jsonl"
+
+def spill_messages(messages: List[Dict]):
+    """Append messages to the session's spill file"""
+    with open(get_spill_file(), "ab") as f:
+        f.writelines(orjson.dumps(message) + b"\n" for message in messages)
+
+def load_spilled_messages() -> List[Dict]:
+    """Load the messages spilled out of session state, oldest first"""
+    spill_file = get_spill_file()
+    if not spill_file.exists():
+        return []
+    with open(spill_file, "rb") as f:
+        return [orjson.loads(line) for line in f if line.strip()]
+
+def discard_spilled_messages():
+    """Delete the session's spill file"""
+    get_spill_file().unlink(missing_ok=True)
+
+def clear_stale_spill_files():
+    """Delete spill files of other sessions that have not been written to for SPILL_FILE_MAX_AGE_SECONDS"""
+    own_spill_file = get_spill_file()
+    cutoff = time.time() - SPILL_FILE_MAX_AGE_SECONDS
+    for spill_file in SPILL_DIR.glob("*.jsonl"):
+        try:
+            if spill_file != own_spill_file and spill_file.stat().st_mtime < cutoff:
+                spill_file.unlink()
+        except FileNotFoundError:
+            pass
+
+def get_active_session_id() -> str:
+    """Session ID the active chat will be saved under"""
+    return st.session_state.current_chat_id or get_session_id()
+
+def set_chat_history(messages: List[Dict], saved_offset: int = 0):
+    """Replace the chat history and rebuild the prompt window from it.
+
+    saved_offset is the number of leading messages of the saved chat file
+    that are not held in session state.
+    """
+    st.session_state.chat_history = messages
+    st.session_state.saved_offset = saved_offset
+    st.session_state.spilled_count = 0
+    st.session_state.prompt_buffer = deque(
+        (format_prompt_line(message) for message in messages[-PROMPT_WINDOW_MESSAGES:]),
+        maxlen=PROMPT_WINDOW_MESSAGES
+    )
+
+def add_chat_message(role: str, content: str):
+    """Append a message to the chat history and the prompt window"""
+    message = {"role": role, "content": content}
+    chat_history = st.session_state.chat_history
+    chat_history.append(message)
+    st.session_state.prompt_buffer.append(format_prompt_line(message))
+    if len(chat_history) > MAX_SESSION_MESSAGES:
+        overflow = len(chat_history) - MAX_SESSION_MESSAGES
+        spill_messages(chat_history[:overflow])
+        st.session_state.spilled_count += overflow
+        del chat_history[:overflow]
+
+def load_saved_chat(session_id: str) -> Dict:
+    """Make a saved chat the active history, keeping only its newest messages in session state"""
+    # Messages spilled by the chat being replaced are abandoned with it
+    discard_spilled_messages()
+    clear_stale_spill_files()
+    chat_data = load_chat_data(session_id)
+    messages = chat_data.get("messages", [])
+    saved_offset = max(len(messages) - MAX_SESSION_MESSAGES, 0)
+    st.session_state.current_chat_id = session_id
+    set_chat_history(messages[saved_offset:], saved_offset)
+    return chat_data
+
+def get_full_chat_history(session_id: str) -> List[Dict]:
+    """Every message of the active chat, including those not held in session state"""
+    saved_offset = st.session_state.saved_offset
+    saved_prefix = load_chat_data(session_id).get("messages", [])[:saved_offset] if saved_offset else []
+    return saved_prefix + load_spilled_messages() + st.session_state.chat_history
+
+def build_conversation_prompt() -> str:
+    """Join the prompt window, dropping the oldest messages once it exceeds MAX_PROMPT_CHARS"""
+    prompt_buffer = st.session_state.prompt_buffer
+    while len(prompt_buffer) > 1 and sum(map(len, prompt_buffer)) > MAX_PROMPT_CHARS:
+        prompt_buffer.popleft()
+    return "\n".join(prompt_buffer)
+
+def render_chat_history(messages: List[Dict]):
+    """Render messages, merging consecutive same-role messages into one block"""
+    for role, group in groupby(messages, key=itemgetter("role")):
+        st.chat_message(role).markdown(MESSAGE_SEPARATOR.join(message["content"] for message in group))
+
 def show_chat_management():
     """Show chat management interface"""
     st.subheader("💾 Chat Management")
@@ -97,80 +371,126 @@ def show_chat_management():
         st.info("No saved chats yet")
         return
     
-    # Chat list with management options
-    for chat in chats:
-        with st.expander(f"🗨️ {chat['name']} ({chat['agent']}) - {chat['message_count']} messages"):
-            col1, col2 = st.columns([2, 1])
-            
-            with col1:
-                # Chat metadata display and editing
-                current_name = st.text_input(
-                    "Chat Name:", 
-                    value=chat['name'], 
-                    key=f"name_{chat['id']}"
-                )
-                
-                current_rating = st.selectbox(
-                    "Rating:", 
-                    options=[None, 1, 2, 3, 4, 5],
-                    index=0 if chat['rating'] is None else chat['rating'],
-                    key=f"rating_{chat['id']}"
-                )
-                
-                current_notes = st.text_area(
-                    "Notes:", 
-                    value=chat['notes'], 
-                    key=f"notes_{chat['id']}",
-                    height=100
-                )
-                
-                # Display chat info
-                st.caption(f"Created: {chat['created']} | Agent: {chat['agent']}")
-            
-            with col2:
-                st.write("**Actions:**")
-                
-                # Update metadata button
-                if st.button("💾 Update", key=f"update_{chat['id']}"):
-                    chat_data = load_chat_data(chat['id'])
-                    metadata = chat_data.get("metadata", {})
-                    metadata.update({
-                        "name": current_name,
-                        "rating": current_rating,
-                        "notes": current_notes,
-                        "created": metadata.get("created", chat['id']),
-                        "agent": metadata.get("agent", chat['agent'])
-                    })
-                    save_chat_data(chat['id'], chat_data.get("messages", []), metadata)
-                    st.success("Updated!")
-                    st.rerun()
-                
-                # Load chat button
-                if st.button("📂 Load", key=f"load_{chat['id']}"):
-                    chat_data = load_chat_data(chat['id'])
-                    st.session_state.chat_history = chat_data.get("messages", [])
-                    st.session_state.current_chat_id = chat['id']
-                    st.success(f"Loaded: {chat['name']}")
-                    st.rerun()
-                
-                # Delete chat button
-                if st.button("🗑️ Delete", key=f"delete_{chat['id']}", type="secondary"):
-                    if st.session_state.get(f"confirm_delete_{chat['id']}", False):
-                        delete_chat(chat['id'])
-                        st.success("Deleted!")
-                        st.rerun()
-                    else:
-                        st.session_state[f"confirm_delete_{chat['id']}"] = True
-                        st.warning("Click again to confirm deletion")
+    # One editable table for every chat instead of a widget tree per chat
+    rows = [{column: chat[column] for column in CHAT_TABLE_COLUMNS} for chat in chats]
+    edited_rows = st.data_editor(
+        rows,
+        key="chat_table",
+        hide_index=True,
+        use_container_width=True,
+        column_order=CHAT_TABLE_COLUMNS[1:],
+        disabled=("created", "agent", "message_count"),
+        column_config={
+            "name": st.column_config.TextColumn("Chat Name", required=True),
+            "rating": st.column_config.SelectboxColumn("Rating", options=[1, 2, 3, 4, 5]),
+            "notes": st.column_config.TextColumn("Notes", width="large"),
+            "created": "Created",
+            "agent": "Agent",
+            "message_count": "Messages",
+        },
+    )
+    
+    changed = []
+    for chat, row in zip(chats, edited_rows):
+        # A cleared name cell comes back as None; keep the saved name
+        edits = (row["name"] or chat['name'], normalize_rating(row["rating"]), row["notes"] or "")
+        # Skip rewriting chat files that were not edited
+        if edits != (chat['name'], chat['rating'], chat['notes']):
+            changed.append((chat, edits))
+    
+    if st.button("💾 Save changes", disabled=not changed):
+        for chat, (name, rating, notes) in changed:
+            update_chat_metadata(chat, name, rating, notes)
+        st.success(f"Updated {len(changed)} chat(s)!")
+        st.rerun()
+    
+    # Load and delete act on a single selected row
+    labels = {chat['id']: f"{chat['name']} ({chat['agent']}) - {chat['message_count']} messages" for chat in chats}
+    selected_id = st.selectbox("Chat:", list(labels), format_func=labels.get, key="managed_chat")
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        if st.button("📂 Load", key="load_chat"):
+            chat_data = load_saved_chat(selected_id)
+            st.success(f"Loaded: {chat_data.get('metadata', {}).get('name', selected_id)}")
+            st.rerun()
+    
+    with col2:
+        if st.button("🗑️ Delete", key="delete_chat", type="secondary"):
+            if st.session_state.get(f"confirm_delete_{selected_id}", False):
+                delete_chat(selected_id)
+                st.success("Deleted!")
+                st.rerun()
+            else:
+                st.session_state[f"confirm_delete_{selected_id}"] = True
+                st.warning("Click again to confirm deletion")
+
+def normalize_rating(value) -> Optional[int]:
+    """Convert a rating cell from the chat table back to None or an int"""
+    # Empty cells in a numeric column come back as NaN
+    if value is None or value != value:
+        return None
+    return int(value)
+
+def update_chat_metadata(chat: Dict, name: str, rating: Optional[int], notes: str):
+    """Rewrite a saved chat with edited name, rating and notes"""
+    chat_data = load_chat_data(chat['id'])
+    metadata = chat_data.get("metadata", {})
+    metadata.update({
+        "name": name,
+        "rating": rating,
+        "notes": notes,
+        "created": metadata.get("created", chat['id']),
+        "agent": metadata.get("agent", chat['agent'])
+    })
+    save_chat_data(chat['id'], chat_data.get("messages", []), metadata)
 
-async def run_agent_async(agent, prompt: str, context: Dict = None):
-    """Run agent asynchronously"""
-    result = await Runner.run(
+async def stream_agent_async(agent, prompt: str, context: Dict = None):
+    """Run agent asynchronously, yielding response text as it is generated"""
+    result = Runner.run_streamed(
         agent,
         input=prompt,
         context=context or {}
     )
-    return result.final_output
+    streamed = False
+    async for event in result.stream_events():
+        if event.type == "raw_response_event" and isinstance(event.data, ResponseTextDeltaEvent):
+            streamed = True
+            yield event.data.delta
+    # Fall back to the final output if the model produced no text deltas
+    if not streamed:
+        yield str(result.final_output)
+
+@st.cache_resource
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """Start the background event loop shared by all agent runs in this process"""
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    return loop
+
+@st.cache_resource
+def configure_openai_client() -> AsyncOpenAI:
+    """Create one keep-alive OpenAI client and make the agents SDK use it for every run"""
+    client = AsyncOpenAI(
+        api_key=OPENAI_API_KEY,
+        http_client=DefaultAsyncHttpxClient(
+            limits=httpx.Limits(max_keepalive_connections=OPENAI_KEEPALIVE_CONNECTIONS)
+        )
+    )
+    set_default_openai_client(client)
+    return client
+
+def run_coroutine(coro):
+    """Run a coroutine on the shared event loop and wait for its result"""
+    return asyncio.run_coroutine_threadsafe(coro, get_event_loop()).result()
+
+def iterate_async(async_gen):
+    """Consume an async generator from synchronous code via the shared event loop"""
+    while True:
+        try:
+            yield run_coroutine(async_gen.__anext__())
+        except StopAsyncIteration:
+            return
 
 def main():
     st.set_page_config(
@@ -180,18 +500,18 @@ def main():
     )
     
     st.title("🍸 Cocktail Development Assistant")
+    configure_openai_client()
     
     # Initialize session state
-    if 'selected_agent' not in st.session_state:
-        st.session_state.selected_agent = None
-    if 'chat_active' not in st.session_state:
-        st.session_state.chat_active = False
-    if 'chat_history' not in st.session_state:
-        st.session_state.chat_history = []
-    if 'current_chat_id' not in st.session_state:
-        st.session_state.current_chat_id = None
-    if 'chat_name' not in st.session_state:
-        st.session_state.chat_name = ""
+    for key, default in SESSION_DEFAULTS.items():
+        st.session_state.setdefault(key, default)
+    if 'prompt_buffer' not in st.session_state:
+        set_chat_history(st.session_state.get('chat_history', []))
+    
+    # Resolve the active agent once per rerun
+    chat_active = st.session_state.chat_active
+    selected_agent = st.session_state.selected_agent
+    current_agent = AGENTS[selected_agent] if chat_active else None
     
     # Main tabs
     tab1, tab2 = st.tabs(["💬 Chat", "📋 Manage Chats"])
@@ -204,38 +524,30 @@ def main():
         with st.sidebar:
             st.header("Agent Selection")
             
-            # Agent descriptions
-            agent_descriptions = {
-                "main": "🎯 Main orchestrator for cocktail development conversations",
-                "wine": "🍷 Specialized agent for wine selection and pairing",
-                "cocktail_spec_finder": "🔍 Finds cocktail specifications from the web",
-                "flavor_affinity": "🌿 Discovers flavor affinities and combinations",
-                "cocktail_spec_analyzer": "📊 Analyzes cocktail specifications and provides feedback",
-                "cocktail_naming": "✨ Creates creative names for cocktails",
-                "bottle_inventory": "📋 Manages and searches bottle inventory",
-                "instagram_post": "📱 Searches historical Instagram posts",
-                "bottle_researcher": "🔬 Researches and updates bottle information"
-            }
-            
-            # Display agent options
-            for agent_key, description in agent_descriptions.items():
-                if st.button(description, key=f"btn_{agent_key}", use_container_width=True):
-                    if st.session_state.chat_active:
-                        st.warning("Please end the current chat before selecting a new agent.")
-                    else:
-                        st.session_state.selected_agent = agent_key
-                        st.session_state.chat_active = True
-                        st.session_state.chat_history = []
-                        st.session_state.current_chat_id = None
-                        st.session_state.chat_name = ""
-                        reset_session_id()  # Ensure new unique session ID
-                        st.rerun()
+            # One radio widget for all agents; locked while a chat is active
+            choice = st.radio(
+                "Agent",
+                AGENT_KEYS,
+                index=AGENT_KEYS.index(selected_agent) if selected_agent in AGENT_KEYS else None,
+                format_func=AGENT_DESCRIPTIONS.get,
+                disabled=chat_active,
+                label_visibility="collapsed",
+                help="End the current chat before selecting a new agent." if chat_active else None
+            )
+            if choice is not None and choice != selected_agent:
+                st.session_state.selected_agent = choice
+                st.session_state.chat_active = True
+                set_chat_history([])
+                st.session_state.current_chat_id = None
+                st.session_state.chat_name = ""
+                reset_session_id()  # Ensure new unique session ID
+                st.rerun()
             
             st.divider()
             
             # Chat controls and metadata
-            if st.session_state.chat_active:
-                st.success(f"Active: {AGENTS[st.session_state.selected_agent].name}")
+            if chat_active:
+                st.success(f"Active: {current_agent.name}")
                 
                 # Chat naming
                 new_chat_name = st.text_input(
@@ -249,23 +561,26 @@ def main():
                 if st.button("🛑 End Chat", use_container_width=True):
                     # Save chat with metadata
                     if st.session_state.chat_history:
-                        session_id = st.session_state.current_chat_id or get_session_id()
-                        chat_name = st.session_state.chat_name or f"Chat with {AGENTS[st.session_state.selected_agent].name}"
+                        session_id = get_active_session_id()
+                        chat_name = st.session_state.chat_name or f"Chat with {current_agent.name}"
                         
                         metadata = {
                             "name": chat_name,
                             "created": session_id,
-                            "agent": st.session_state.selected_agent,
+                            "agent": selected_agent,
                             "rating": None,
                             "notes": ""
                         }
                         
-                        save_chat_data(session_id, st.session_state.chat_history, metadata)
+                        messages = get_full_chat_history(session_id)
+                        save_chat_data(session_id, messages, metadata)
+                        discard_spilled_messages()
                         st.info(f"Chat saved: {chat_name}")
+                    clear_stale_spill_files()
                     
                     st.session_state.chat_active = False
                     st.session_state.selected_agent = None
-                    st.session_state.chat_history = []
+                    set_chat_history([])
                     st.session_state.current_chat_id = None
                     st.session_state.chat_name = ""
                     reset_session_id()  # Reset for next chat
@@ -275,19 +590,16 @@ def main():
             
             # Quick load recent chats
             st.subheader("🕒 Recent Chats")
-            recent_chats = get_all_chats()[:5]  # Show last 5 chats
+            recent_chats = get_recent_chats(5)  # Show last 5 chats
             if recent_chats:
                 for chat in recent_chats:
-                    rating_display = "⭐" * (chat['rating'] or 0) if chat['rating'] else ""
                     if st.button(
-                        f"{chat['name'][:25]}... {rating_display}", 
+                        chat['display_label'],
                         key=f"quick_load_{chat['id']}",
                         use_container_width=True,
                         help=f"Agent: {chat['agent']} | Messages: {chat['message_count']}"
                     ):
-                        chat_data = load_chat_data(chat['id'])
-                        st.session_state.chat_history = chat_data.get("messages", [])
-                        st.session_state.current_chat_id = chat['id']
+                        load_saved_chat(chat['id'])
                         st.session_state.chat_name = chat['name']
                         st.success(f"Loaded: {chat['name']}")
                         st.rerun()
@@ -295,71 +607,69 @@ def main():
                 st.info("No saved chats yet")
     
     # Main chat interface
-    if not st.session_state.chat_active:
+    if not chat_active:
         st.info("👈 Select an agent from the sidebar to start chatting!")
         
         # Show available agents
         st.subheader("Available Agents")
         cols = st.columns(3)
-        for i, (agent_key, description) in enumerate(agent_descriptions.items()):
+        for i, (agent_key, description) in enumerate(AGENT_ITEMS):
             with cols[i % 3]:
                 st.markdown(f"**{description}**")
     
     else:
-        current_agent = AGENTS[st.session_state.selected_agent]
-        st.subheader(f"Chatting with: {current_agent.name}")
+        chat_fragment(current_agent)
+
+@st.fragment
+def chat_fragment(current_agent):
+    """Chat history and input; submitting a message reruns only this fragment"""
+    st.subheader(f"Chatting with: {current_agent.name}")
+    
+    # Display chat history
+    chat_container = st.container()
+    with chat_container:
+        chat_history = st.session_state.chat_history
+        # Messages held on disk: the saved file's prefix and this session's spill file
+        offloaded_count = st.session_state.saved_offset + st.session_state.spilled_count
+        earlier_count = offloaded_count + len(chat_history) - RENDER_WINDOW_MESSAGES
+        # Older messages are only rendered on request, paged in from disk if needed
+        if earlier_count > 0 and st.toggle(f"Show {earlier_count} earlier messages", key="show_earlier_messages"):
+            if offloaded_count:
+                full_history = get_full_chat_history(get_active_session_id())
+            else:
+                full_history = chat_history
+            render_chat_history(full_history[:earlier_count])
+        render_chat_history(chat_history[-RENDER_WINDOW_MESSAGES:])
+    
+    # Chat input
+    if prompt := st.chat_input("What would you like to discuss?"):
+        # Add user message
+        add_chat_message("user", prompt)
         
-        # Display chat history
-        chat_container = st.container()
-        with chat_container:
-            for message in st.session_state.chat_history:
-                if message["role"] == "user":
-                    with st.chat_message("user"):
-                        st.write(message["content"])
-                else:
-                    with st.chat_message("assistant"):
-                        st.write(message["content"])
+        # Display user message immediately
+        with st.chat_message("user"):
+            st.write(prompt)
         
-        # Chat input
-        if prompt := st.chat_input("What would you like to discuss?"):
-            # Add user message
-            st.session_state.chat_history.append({"role": "user", "content": prompt})
-            
-            # Display user message immediately
-            with st.chat_message("user"):
-                st.write(prompt)
-            
-            # Get AI response
-            with st.chat_message("assistant"):
-                with st.spinner("Thinking..."):
-                    try:
-                        # Create context from recent history
-                        context = {"preferences": {}}
-                        conversation_prompt = "\n".join(
-                            f"{msg['role']}: {msg['content']}" 
-                            for msg in st.session_state.chat_history[-6:]
-                        )
-                        
-                        # Run agent asynchronously
-                        response = asyncio.run(
-                            run_agent_async(current_agent, conversation_prompt, context)
-                        )
-                        
-                        st.write(response)
-                        
-                        # Add assistant response to history
-                        st.session_state.chat_history.append({
-                            "role": "assistant", 
-                            "content": response
-                        })
-                        
-                    except Exception as e:
-                        error_msg = f"Error: {str(e)}"
-                        st.error(error_msg)
-                        st.session_state.chat_history.append({
-                            "role": "assistant", 
-                            "content": error_msg
-                        })
+        # Get AI response
+        with st.chat_message("assistant"):
+            with st.spinner("Thinking..."):
+                try:
+                    # Create context from recent history
+                    context = {"preferences": {}}
+                    conversation_prompt = build_conversation_prompt()
+                    
+                    # Stream the agent's response as it is generated
+                    response = st.write_stream(
+                        iterate_async(stream_agent_async(current_agent, conversation_prompt, context))
+                    )
+                    
+                    # Add assistant response to history
+                    add_chat_message("assistant", response)
+                    
+                except Exception as e:
+                    error_msg = f"Error: {str(e)}"
+                    st.error(error_msg)
+                    add_chat_message("assistant", error_msg)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file